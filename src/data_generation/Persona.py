@@ -4,8 +4,10 @@ Base classes for different user personas with distinct behavioral patterns.
 
 from datetime import datetime, timedelta
 import random
+from itertools import accumulate
 from dataclasses import dataclass
 from enum import Enum
+from types import MappingProxyType
 
 class LogType(Enum):
     GLUCOSE = "glucose"
@@ -19,7 +21,7 @@ class LogType(Enum):
     NOTES = "notes"
     OTHER = "other"
 
-@dataclass
+@dataclass(slots=True)
 class LogEntry:
     """Represents a single log entry with all its attributes."""
     timestamp: datetime
@@ -27,6 +29,10 @@ class LogEntry:
     message: str
     metadata: dict = None
 
+    def to_dict(self):
+        """Get the entry's fields as a dict, in declaration order, for JSON serialization."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
 class Trait:
     """Base class for defining behavioral traits."""
     def __init__(self, name, description):
@@ -36,7 +42,7 @@ class Trait:
 
 class ConsistencyTrait(Trait):
     """Trait defining time consistency patterns."""
-    def __init__(self, is_consistent):
+    def __init__(self, is_consistent, rng=random):
         if is_consistent:
             super().__init__(
                 "consistent",
@@ -48,7 +54,7 @@ class ConsistencyTrait(Trait):
                 (-30, 30),    # Moderately consistent: ±30 minutes
                 (-45, 45)     # Somewhat consistent: ±45 minutes
             ]
-            self.time_variation = random.choice(consistency_patterns)
+            self.time_variation = rng.choice(consistency_patterns)
             self.prompt_modifier = (
                 "- Maintains strict adherence to logging schedule\n"
                 "- Uses precise timestamps and regular intervals\n"
@@ -66,7 +72,7 @@ class ConsistencyTrait(Trait):
                 (-120, 120),  # Moderately inconsistent: ±2 hours
                 (-180, 180)   # Very inconsistent: ±3 hours
             ]
-            self.time_variation = random.choice(inconsistency_patterns)
+            self.time_variation = rng.choice(inconsistency_patterns)
             self.prompt_modifier = (
                 "- Has irregular logging patterns\n"
                 "- Often logs at varying times\n"
@@ -76,7 +82,7 @@ class ConsistencyTrait(Trait):
 
 class FrequencyTrait(Trait):
     """Trait defining logging frequency patterns."""
-    def __init__(self, is_frequent):
+    def __init__(self, is_frequent, rng=random):
         if is_frequent:
             super().__init__(
                 "frequent",
@@ -88,7 +94,7 @@ class FrequencyTrait(Trait):
                 (4, 6),  # Very frequent: 4-6 logs per day
                 (5, 8)   # Extremely frequent: 5-8 logs per day
             ]
-            self.logs_per_day = random.choice(frequency_patterns)
+            self.logs_per_day = rng.choice(frequency_patterns)
             self.prompt_modifier = (
                 "- Logs multiple times throughout the day\n"
                 "- Provides frequent updates on status\n"
@@ -106,7 +112,7 @@ class FrequencyTrait(Trait):
                 (1, 2),  # Moderately infrequent: 1-2 logs per day
                 (2, 3)   # Somewhat infrequent: 2-3 logs per day
             ]
-            self.logs_per_day = random.choice(infrequency_patterns)
+            self.logs_per_day = rng.choice(infrequency_patterns)
             self.prompt_modifier = (
                 "- Logs once or twice per day\n"
                 "- Provides essential updates only\n"
@@ -116,52 +122,94 @@ class FrequencyTrait(Trait):
 
 class VarietyTrait(Trait):
     """Trait defining log type and content variety patterns."""
-    def __init__(self, is_varied):
+    
+    # Log type weight patterns to choose between, shared read-only by all instances
+    VARIED_PATTERNS = (
+        MappingProxyType({  # Balanced variety
+            LogType.GLUCOSE: 3,
+            LogType.DIET: 3,
+            LogType.MOOD: 3,
+            LogType.ACTIVITY: 3,
+            LogType.INSULIN: 3,
+            LogType.MEDICATION: 3,
+            LogType.SLEEP: 2,
+            LogType.WEIGHT: 2,
+            LogType.NOTES: 2,
+            LogType.OTHER: 2
+        }),
+        MappingProxyType({  # Health-focused variety
+            LogType.GLUCOSE: 4,
+            LogType.DIET: 4,
+            LogType.MOOD: 2,
+            LogType.ACTIVITY: 3,
+            LogType.INSULIN: 4,
+            LogType.MEDICATION: 3,
+            LogType.SLEEP: 2,
+            LogType.WEIGHT: 2,
+            LogType.NOTES: 1,
+            LogType.OTHER: 1
+        }),
+        MappingProxyType({  # Lifestyle-focused variety
+            LogType.GLUCOSE: 2,
+            LogType.DIET: 4,
+            LogType.MOOD: 4,
+            LogType.ACTIVITY: 4,
+            LogType.INSULIN: 2,
+            LogType.MEDICATION: 2,
+            LogType.SLEEP: 3,
+            LogType.WEIGHT: 2,
+            LogType.NOTES: 3,
+            LogType.OTHER: 2
+        })
+    )
+    
+    SIMILAR_PATTERNS = (
+        MappingProxyType({  # Glucose-focused
+            LogType.GLUCOSE: 6,
+            LogType.DIET: 2,
+            LogType.MOOD: 1,
+            LogType.ACTIVITY: 1,
+            LogType.INSULIN: 3,
+            LogType.MEDICATION: 1,
+            LogType.SLEEP: 1,
+            LogType.WEIGHT: 1,
+            LogType.NOTES: 1,
+            LogType.OTHER: 1
+        }),
+        MappingProxyType({  # Diet-focused
+            LogType.GLUCOSE: 3,
+            LogType.DIET: 6,
+            LogType.MOOD: 1,
+            LogType.ACTIVITY: 2,
+            LogType.INSULIN: 2,
+            LogType.MEDICATION: 1,
+            LogType.SLEEP: 1,
+            LogType.WEIGHT: 2,
+            LogType.NOTES: 1,
+            LogType.OTHER: 1
+        }),
+        MappingProxyType({  # Medication-focused
+            LogType.GLUCOSE: 3,
+            LogType.DIET: 2,
+            LogType.MOOD: 1,
+            LogType.ACTIVITY: 1,
+            LogType.INSULIN: 3,
+            LogType.MEDICATION: 6,
+            LogType.SLEEP: 1,
+            LogType.WEIGHT: 1,
+            LogType.NOTES: 2,
+            LogType.OTHER: 1
+        })
+    )
+    
+    def __init__(self, is_varied, rng=random):
         if is_varied:
             super().__init__(
                 "varied",
                 "Uses diverse log types and detailed content"
             )
             # Choose between different variety patterns
-            variety_patterns = [
-                {  # Balanced variety
-                    LogType.GLUCOSE: 3,
-                    LogType.DIET: 3,
-                    LogType.MOOD: 3,
-                    LogType.ACTIVITY: 3,
-                    LogType.INSULIN: 3,
-                    LogType.MEDICATION: 3,
-                    LogType.SLEEP: 2,
-                    LogType.WEIGHT: 2,
-                    LogType.NOTES: 2,
-                    LogType.OTHER: 2
-                },
-                {  # Health-focused variety
-                    LogType.GLUCOSE: 4,
-                    LogType.DIET: 4,
-                    LogType.MOOD: 2,
-                    LogType.ACTIVITY: 3,
-                    LogType.INSULIN: 4,
-                    LogType.MEDICATION: 3,
-                    LogType.SLEEP: 2,
-                    LogType.WEIGHT: 2,
-                    LogType.NOTES: 1,
-                    LogType.OTHER: 1
-                },
-                {  # Lifestyle-focused variety
-                    LogType.GLUCOSE: 2,
-                    LogType.DIET: 4,
-                    LogType.MOOD: 4,
-                    LogType.ACTIVITY: 4,
-                    LogType.INSULIN: 2,
-                    LogType.MEDICATION: 2,
-                    LogType.SLEEP: 3,
-                    LogType.WEIGHT: 2,
-                    LogType.NOTES: 3,
-                    LogType.OTHER: 2
-                }
-            ]
-            self.log_type_weights = random.choice(variety_patterns)
+            self.log_type_weights = rng.choice(self.VARIED_PATTERNS)
             self.prompt_modifier = (
                 "- Uses diverse log types\n"
                 "- Provides varied and detailed content\n"
@@ -174,45 +222,7 @@ class VarietyTrait(Trait):
                 "Focuses on specific log types with similar content"
             )
             # Choose between different similarity patterns
-            similarity_patterns = [
-                {  # Glucose-focused
-                    LogType.GLUCOSE: 6,
-                    LogType.DIET: 2,
-                    LogType.MOOD: 1,
-                    LogType.ACTIVITY: 1,
-                    LogType.INSULIN: 3,
-                    LogType.MEDICATION: 1,
-                    LogType.SLEEP: 1,
-                    LogType.WEIGHT: 1,
-                    LogType.NOTES: 1,
-                    LogType.OTHER: 1
-                },
-                {  # Diet-focused
-                    LogType.GLUCOSE: 3,
-                    LogType.DIET: 6,
-                    LogType.MOOD: 1,
-                    LogType.ACTIVITY: 2,
-                    LogType.INSULIN: 2,
-                    LogType.MEDICATION: 1,
-                    LogType.SLEEP: 1,
-                    LogType.WEIGHT: 2,
-                    LogType.NOTES: 1,
-                    LogType.OTHER: 1
-                },
-                {  # Medication-focused
-                    LogType.GLUCOSE: 3,
-                    LogType.DIET: 2,
-                    LogType.MOOD: 1,
-                    LogType.ACTIVITY: 1,
-                    LogType.INSULIN: 3,
-                    LogType.MEDICATION: 6,
-                    LogType.SLEEP: 1,
-                    LogType.WEIGHT: 1,
-                    LogType.NOTES: 2,
-                    LogType.OTHER: 1
-                }
-            ]
-            self.log_type_weights = random.choice(similarity_patterns)
+            self.log_type_weights = rng.choice(self.SIMILAR_PATTERNS)
             self.prompt_modifier = (
                 "- Focuses on specific log types\n"
                 "- Uses similar content patterns\n"
@@ -223,70 +233,84 @@ class VarietyTrait(Trait):
 class Persona:
     """Base class for user personas with different adherence patterns."""
     
-    def __init__(self, user_id, consistency, frequency, variety):
+    # Base time preferences for logging
+    TIME_PREFERENCES = MappingProxyType({
+        "morning": (6, 9),    # 6:00-9:00
+        "afternoon": (12, 15), # 12:00-15:00
+        "evening": (18, 21)   # 18:00-21:00
+    })
+    # Start hour of each preferred period, in TIME_PREFERENCES order
+    PERIOD_START_HOURS = tuple(start_hour for start_hour, _ in TIME_PREFERENCES.values())
+    
+    def __init__(self, user_id, consistency, frequency, variety, rng=None):
         self.user_id = user_id
-        self.consistency_trait = ConsistencyTrait(consistency)
-        self.frequency_trait = FrequencyTrait(frequency)
-        self.variety_trait = VarietyTrait(variety)
+        # Generator for trait selection and per-log draws; pass a seeded one for reproducible logs
+        self._rng = rng if rng is not None else random.Random()
+        self.consistency_trait = ConsistencyTrait(consistency, self._rng)
+        self.frequency_trait = FrequencyTrait(frequency, self._rng)
+        self.variety_trait = VarietyTrait(variety, self._rng)
+        # Traits are fixed once created, so their prompt modifiers are joined once here
+        self.prompt_modifiers = "\n".join([
+            self.consistency_trait.prompt_modifier,
+            self.frequency_trait.prompt_modifier,
+            self.variety_trait.prompt_modifier
+        ])
         self._initialize_behavior_patterns()
     
     def _initialize_behavior_patterns(self):
         """Initialize persona-specific behavior patterns."""
         self.log_type_weights = self.variety_trait.log_type_weights
-        
-        # Base time preferences for logging
-        self.time_preferences = {
-            "morning": (6, 9),    # 6:00-9:00
-            "afternoon": (12, 15), # 12:00-15:00
-            "evening": (18, 21)   # 18:00-21:00
-        }
+        # Log types and their cumulative weights, so a day's draws are a single random.choices call
+        self.log_types = tuple(self.log_type_weights)
+        self.log_type_cum_weights = list(accumulate(self.log_type_weights.values()))
+        self.time_preferences = self.TIME_PREFERENCES
     
     def generate_log_times(self, day_start, day, logs_per_day):
-        """Generate log times for a given day based on persona pattern."""
+        """Generate log times for a given day based on persona pattern, in ascending order."""
         # Use the provided logs_per_day parameter
         # Note: 'day' parameter is not used in base class but maintained for consistency with subclasses
-        actual_logs = logs_per_day
-        times = []
-        
-        if self.consistency_trait.name == "consistent":
+        offsets = self._draw_minute_offsets(self.consistency_trait, logs_per_day)
+        return [day_start + timedelta(minutes=offset) for offset in offsets]
+    
+    def _draw_minute_offsets(self, consistency_trait, num_logs):
+        """Draw sorted log times as integer minutes, so datetimes are built only once per log."""
+        if consistency_trait.name == "consistent":
             # Distribute logs evenly across preferred time periods
-            periods = list(self.time_preferences.items())
-            for i in range(actual_logs):
-                period = periods[i % len(periods)]
-                start_hour, _ = period[1]
-                base_time = day_start + timedelta(hours=start_hour)
-                variation = random.randint(*self.consistency_trait.time_variation)
-                times.append(base_time + timedelta(minutes=variation))
+            start_hours = self.PERIOD_START_HOURS
+            min_variation, max_variation = consistency_trait.time_variation
+            offsets = [
+                start_hours[i % len(start_hours)] * 60 + self._rng.randint(min_variation, max_variation)
+                for i in range(num_logs)
+            ]
         else:
-            # Random times during waking hours
-            for _ in range(actual_logs):
-                hour = random.randint(6, 22)
-                minute = random.randint(0, 59)
-                times.append(day_start + timedelta(hours=hour, minutes=minute))
+            # Random times during waking hours: hour 6-22 and any minute
+            offsets = [self._rng.randrange(6 * 60, 23 * 60) for _ in range(num_logs)]
         
-        return sorted(times)
+        offsets.sort()
+        return offsets
     
     def get_log_type_weights(self):
         """Get weights for different log types based on persona characteristics."""
         return self.log_type_weights
     
+    def choose_log_types(self, k):
+        """Draw k log types according to this persona's log type weights."""
+        return self._rng.choices(self.log_types, cum_weights=self.log_type_cum_weights, k=k)
+    
     def get_time_variation(self):
         """Get the amount of time variation in minutes for this persona."""
-        return random.randint(*self.consistency_trait.time_variation)
+        return self._rng.randint(*self.consistency_trait.time_variation)
     
     def get_prompt_modifiers(self):
         """Get all prompt modifiers for this persona's traits."""
-        return "\n".join([
-            self.consistency_trait.prompt_modifier,
-            self.frequency_trait.prompt_modifier,
-            self.variety_trait.prompt_modifier
-        ])
+        return self.prompt_modifiers
 
-def create_persona(user_id, consistency, frequency, variety):
+def create_persona(user_id, consistency, frequency, variety, rng=None):
     """Factory function to create persona instances with specified traits."""
     return Persona(
         user_id=user_id,
         consistency=consistency,
         frequency=frequency,
-        variety=variety
+        variety=variety,
+        rng=rng
     )
\ No newline at end of file
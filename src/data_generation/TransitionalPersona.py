@@ -4,6 +4,7 @@ Defines the TransitionalPersona class for generating logs with behavioral change
 
 from Persona import Persona, ConsistencyTrait, FrequencyTrait, VarietyTrait, LogType
 from datetime import datetime, timedelta
+from itertools import accumulate
 import random
 
 class TransitionalPersona(Persona):
@@ -19,7 +20,8 @@ class TransitionalPersona(Persona):
         final_consistency: bool,
         final_frequency: bool,
         final_variety: bool,
-        transition_day: int = 15
+        transition_day: int = 15,
+        rng: random.Random | None = None
     ):
         """
         Initialize a transitional persona with initial and final traits.
@@ -33,16 +35,24 @@ class TransitionalPersona(Persona):
             final_frequency: Whether the persona finally logs frequently
             final_variety: Whether the persona finally uses varied log types
             transition_day: The day when the behavior changes (default: 15)
+            rng: Random generator for traits and log draws (default: a new unseeded one)
         """
-        super().__init__(user_id, initial_consistency, initial_frequency, initial_variety)
+        super().__init__(user_id, initial_consistency, initial_frequency, initial_variety, rng)
         
         # Store final traits
-        self.final_consistency_trait = ConsistencyTrait(final_consistency)
-        self.final_frequency_trait = FrequencyTrait(final_frequency)
-        self.final_variety_trait = VarietyTrait(final_variety)
+        self.final_consistency_trait = ConsistencyTrait(final_consistency, self._rng)
+        self.final_frequency_trait = FrequencyTrait(final_frequency, self._rng)
+        self.final_variety_trait = VarietyTrait(final_variety, self._rng)
+        # Final-phase counterparts of the log types and cumulative weights set up by Persona
+        self.final_log_types = tuple(self.final_variety_trait.log_type_weights)
+        self.final_log_type_cum_weights = list(accumulate(self.final_variety_trait.log_type_weights.values()))
         
         self.transition_day = transition_day
         
+        # Trait tuples for each phase, returned as-is by get_current_traits
+        self.initial_traits = (self.consistency_trait, self.frequency_trait, self.variety_trait)
+        self.final_traits = (self.final_consistency_trait, self.final_frequency_trait, self.final_variety_trait)
+        
     def get_current_traits(self, current_day: int) -> tuple[ConsistencyTrait, FrequencyTrait, VarietyTrait]:
         """
         Get the current traits based on the day.
@@ -54,17 +64,9 @@ class TransitionalPersona(Persona):
             tuple: (consistency_trait, frequency_trait, variety_trait)
         """
         if current_day < self.transition_day:
-            return (
-                self.consistency_trait,
-                self.frequency_trait,
-                self.variety_trait
-            )
+            return self.initial_traits
         else:
-            return (
-                self.final_consistency_trait,
-                self.final_frequency_trait,
-                self.final_variety_trait
-            )
+            return self.final_traits
             
     def get_log_type_weights(self, current_day: int) -> dict[LogType, int]:
         """
@@ -81,6 +83,21 @@ class TransitionalPersona(Persona):
         # Use the variety trait's log type weights, which are already configured
         # based on whether the persona is varied or similar
         return variety.log_type_weights
+    
+    def choose_log_types(self, k: int, current_day: int) -> list[LogType]:
+        """
+        Draw log types according to the weights of the current phase.
+        
+        Args:
+            k: Number of log types to draw
+            current_day: The current day (0-based)
+            
+        Returns:
+            list: k log types
+        """
+        if current_day < self.transition_day:
+            return super().choose_log_types(k)
+        return self._rng.choices(self.final_log_types, cum_weights=self.final_log_type_cum_weights, k=k)
             
     def generate_log_times(self, base_date: datetime, current_day: int, num_logs: int) -> list[datetime]:
         """
@@ -92,32 +109,11 @@ class TransitionalPersona(Persona):
             num_logs: Number of logs to generate
             
         Returns:
-            list: List of datetime objects for log times
+            list: List of datetime objects for log times, in ascending order
         """
         consistency, frequency, variety = self.get_current_traits(current_day)
-        times = []
-        
-        # Base time preferences for logging (same as parent class)
-        time_preferences = {
-            "morning": (6, 9),    # 6:00-9:00
-            "afternoon": (12, 15), # 12:00-15:00
-            "evening": (18, 21)   # 18:00-21:00
-        }
-        
-        if consistency.name == "consistent":
-            # Distribute logs evenly across preferred time periods
-            periods = list(time_preferences.items())
-            for i in range(num_logs):
-                period = periods[i % len(periods)]
-                start_hour, _ = period[1]
-                base_time = base_date.replace(hour=start_hour, minute=0)
-                variation = random.randint(*consistency.time_variation)
-                times.append(base_time + timedelta(minutes=variation))
-        else:
-            # Random times during waking hours
-            for _ in range(num_logs):
-                hour = random.randint(6, 22)
-                minute = random.randint(0, 59)
-                times.append(base_date.replace(hour=hour, minute=minute))
         
-        return sorted(times) 
\ No newline at end of file
+        # Times are set on base_date's calendar day, as minutes from its midnight
+        day_midnight = base_date.replace(hour=0, minute=0)
+        offsets = self._draw_minute_offsets(consistency, num_logs)
+        return [day_midnight + timedelta(minutes=offset) for offset in offsets]
\ No newline at end of file
@@ -11,4 +11,8 @@ MODEL_BATCH_SIZE = 128
 # Parameters to ensure deterministic output
 MODEL_SEED = 2025
 GENERATION_MAX_TOKENS = 100
-GENERATION_TEMPERATURE = 0.0 
\ No newline at end of file
+GENERATION_TEMPERATURE = 0.0
+
+# Optional on-disk cache of deterministic (temperature 0) completions, reused across runs.
+# Set to a file path such as ".llm_cache" to enable; None disables it.
+LLM_CACHE_PATH = None
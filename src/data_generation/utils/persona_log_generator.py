@@ -2,38 +2,31 @@
 Module for generating synthetic logs for different user personas.
 """
 
+import hashlib
 import json
 import random
 import os
-import sys
+import shelve
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from tqdm import tqdm
-from contextlib import contextmanager
 
 from Persona import Persona, create_persona, LogType, LogEntry
 from utils.prompt_generator import build_prompt
 from utils.config import (
     GENERATION_MAX_TOKENS,
-    GENERATION_TEMPERATURE
+    GENERATION_TEMPERATURE,
+    MODEL_SEED,
+    LLM_CACHE_PATH
 )
 
-@contextmanager
-def suppress_stdout():
-    """Temporarily suppress stdout to prevent interference with progress bars."""
-    original_stdout = sys.stdout
-    sys.stdout = open(os.devnull, 'w')
-    try:
-        yield
-    finally:
-        sys.stdout.close()
-        sys.stdout = original_stdout
-
 def generate_message(llm, prompt, max_tokens=GENERATION_MAX_TOKENS, temperature=GENERATION_TEMPERATURE):
     """
     Runs prompt on LLM and returns response.
     
     Args:
-        llm: The language model instance
+        llm: The language model instance, created with verbose=False (as load_llm_model does)
+            so that it does not print over the progress bars
         prompt: The prompt to run
         max_tokens: Maximum number of tokens to generate
         temperature: Temperature for generation (higher = more random)
@@ -41,14 +34,49 @@ def generate_message(llm, prompt, max_tokens=GENERATION_MAX_TOKENS, temperature=
     Returns:
         str: The generated response text
     """
-    with suppress_stdout():
-        response = llm(
-            prompt,
-            max_tokens=max_tokens,
-            temperature=temperature
-        )
+    # Greedy decoding is deterministic, so a repeated prompt can reuse the earlier completion
+    if temperature == 0:
+        return _generate_cached_message(llm, prompt, max_tokens, temperature)
+    return _run_completion(llm, prompt, max_tokens, temperature)
+
+def _run_completion(llm, prompt, max_tokens, temperature):
+    response = llm(
+        prompt,
+        max_tokens=max_tokens,
+        temperature=temperature
+    )
     return response["choices"][0]["text"].strip()
 
+# Greedy completions already produced in this process, least recently used first.
+# Keyed on the model path rather than the model itself, so the cache does not keep
+# a loaded model alive
+_COMPLETION_CACHE = OrderedDict()
+_COMPLETION_CACHE_SIZE = 4096
+
+def _generate_cached_message(llm, prompt, max_tokens, temperature):
+    model_path = getattr(llm, "model_path", None)
+    memo_key = (model_path if model_path is not None else id(llm), prompt, max_tokens, temperature)
+    if memo_key in _COMPLETION_CACHE:
+        _COMPLETION_CACHE.move_to_end(memo_key)
+        return _COMPLETION_CACHE[memo_key]
+    
+    # The on-disk cache outlives the process, so it can only key on a model path
+    if LLM_CACHE_PATH is None or model_path is None:
+        message = _run_completion(llm, prompt, max_tokens, temperature)
+    else:
+        # Key on everything that determines a greedy completion
+        key = hashlib.blake2b(
+            f"{model_path}|{max_tokens}|{temperature}|{prompt}".encode()
+        ).hexdigest()
+        with shelve.open(LLM_CACHE_PATH) as cache:
+            if key not in cache:
+                cache[key] = _run_completion(llm, prompt, max_tokens, temperature)
+            message = cache[key]
+    _COMPLETION_CACHE[memo_key] = message
+    if len(_COMPLETION_CACHE) > _COMPLETION_CACHE_SIZE:
+        _COMPLETION_CACHE.popitem(last=False)
+    return message
+
 def simulate_log(llm, persona, timestamp, log_type):
     """
     Simulates a log entry for a persona at a given timestamp.
@@ -84,7 +112,8 @@ def generate_persona_logs(
     frequency,
     variety,
     days=30,
-    output_dir="synthetic_logs"
+    output_dir="synthetic_logs",
+    rng=None
 ):
     """
     Generates synthetic logs for a specific user persona.
@@ -97,15 +126,19 @@ def generate_persona_logs(
         variety: Whether the persona uses varied log types
         days: Number of days to generate logs for
         output_dir: Directory to save the generated logs
+        rng: Random generator for persona traits and log draws (default: a new unseeded one)
         
     Returns:
         list: List of generated log entries
     """
+    if rng is None:
+        rng = random.Random()
+    
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
     # Create persona instance
-    persona = create_persona(user_id, consistency, frequency, variety)
+    persona = create_persona(user_id, consistency, frequency, variety, rng)
     
     # Generate logs
     logs = []
@@ -118,30 +151,27 @@ def generate_persona_logs(
             
             # Get number of logs for this day based on frequency trait
             min_logs, max_logs = persona.frequency_trait.logs_per_day
-            logs_per_day = random.randint(min_logs, max_logs)
+            logs_per_day = rng.randint(min_logs, max_logs)
             
-            # Get log times for this day
+            # Get log times for this day (already sorted)
             log_times = persona.generate_log_times(day_start, day, logs_per_day)
             
+            # Draw the log types for the whole day at once
+            log_types = persona.choose_log_types(len(log_times))
+            
             # Generate logs for each time point
-            for log_time in sorted(log_times):
-                # Get weighted log types for this persona
-                weighted_log_types = []
-                log_type_weights = persona.get_log_type_weights()
-                for log_type, weight in log_type_weights.items():
-                    weighted_log_types.extend([log_type] * weight)
-                    
-                log_type = random.choice(weighted_log_types)
+            for log_time, log_type in zip(log_times, log_types):
                 log = simulate_log(llm, persona, log_time, log_type)
                 logs.append(log)
             
+            # Set the postfix without redrawing; update() then renders the bar once
+            pbar.set_postfix({"logs": len(logs)}, refresh=False)
             pbar.update(1)
-            pbar.set_postfix({"logs": len(logs)})
     
     # Save logs
     output_file = os.path.join(output_dir, f"{user_id}_logs.json")
     with open(output_file, "w") as f:
-        json.dump([log.__dict__ for log in logs], f, indent=2, default=str)
+        f.write(json.dumps([log.to_dict() for log in logs], indent=2, default=str))
         
     tqdm.write(f"Generated {len(logs)} logs for {user_id}")
     return logs
@@ -149,7 +179,8 @@ def generate_persona_logs(
 def generate_multiple_personas(
     llm,
     days=30,
-    output_dir="synthetic_logs"
+    output_dir="synthetic_logs",
+    seed=MODEL_SEED
 ):
     """
     Generates logs for multiple personas with different trait combinations.
@@ -158,10 +189,13 @@ def generate_multiple_personas(
         llm: The language model instance to use for generation
         days: Number of days to generate logs for
         output_dir: Directory to save the generated logs
+        seed: Seed for the random generator shared by all personas, so reruns are reproducible
         
     Returns:
         dict: Dictionary mapping user IDs to their log entries
     """
+    rng = random.Random(seed)
+    
     # Define all possible trait combinations
     trait_combinations = [
         (True, True, True),    # Consistent, Frequent, Varied
@@ -189,10 +223,11 @@ def generate_multiple_personas(
                 frequency=frequency,
                 variety=variety,
                 days=days,
-                output_dir=output_dir
+                output_dir=output_dir,
+                rng=rng
             )
             all_logs[user_id] = logs
+            pbar.set_postfix({"current": user_id}, refresh=False)
             pbar.update(1)
-            pbar.set_postfix({"current": user_id})
     
     return all_logs 
\ No newline at end of file
@@ -2,8 +2,125 @@
 Module for generating prompts for the LLM model.
 """
 
+from functools import lru_cache
+
 from Persona import LogType, Persona
 
+# Type-specific guidelines for each log type, built once at import
+LOG_TYPE_GUIDELINES = {
+    LogType.GLUCOSE: (
+        "Report your current blood glucose level:\n"
+        "- Include the exact value in mg/dL\n"
+        "- Specify if it's fasting, pre-meal, post-meal (how many hours after), or random\n"
+        "- Mention any factors that might have affected the reading\n"
+        "- Note if the reading is within your target range\n"
+        "Example: 'My fasting glucose this morning was 95 mg/dL, which is within my target range.'"
+    ),
+    LogType.DIET: (
+        "Describe your meal or snack:\n"
+        "- List all foods and beverages consumed\n"
+        "- Include approximate portion sizes\n"
+        "- Estimate carbohydrate content in grams\n"
+        "- Note if it's a regular meal, snack, or special occasion\n"
+        "- Mention if you're following your meal plan\n"
+        "Example: 'For lunch, I had a turkey sandwich (45g carbs) with an apple (15g carbs) and water.'"
+    ),
+    LogType.MOOD: (
+        "Describe your current state:\n"
+        "- Rate your mood on a scale of 1-10\n"
+        "- Note your energy level (low/medium/high)\n"
+        "- Mention any stress, anxiety, or other emotional factors\n"
+        "- Describe how these might affect your diabetes management\n"
+        "- Include any coping strategies you're using\n"
+        "Example: 'My mood is 7/10 today. Feeling energetic but a bit stressed about work deadlines.'"
+    ),
+    LogType.ACTIVITY: (
+        "Report your physical activity:\n"
+        "- Describe the type of exercise or activity\n"
+        "- Include duration in minutes\n"
+        "- Rate intensity (light/moderate/vigorous)\n"
+        "- Note if it's planned or spontaneous\n"
+        "- Mention any impact on blood glucose\n"
+        "Example: 'Did 30 minutes of moderate-intensity walking after dinner. Felt good, no hypoglycemia.'"
+    ),
+    LogType.INSULIN: (
+        "Report your insulin administration:\n"
+        "- Specify insulin type (basal/bolus)\n"
+        "- Include exact dose in units\n"
+        "- Note timing relative to meals\n"
+        "- Mention injection site\n"
+        "- Report any issues with administration\n"
+        "Example: 'Took 6 units of rapid-acting insulin 15 minutes before breakfast. Injected in abdomen.'"
+    ),
+    LogType.MEDICATION: (
+        "Report your medication status:\n"
+        "- List all diabetes-related medications taken\n"
+        "- Include dosage and timing\n"
+        "- Note if any doses were missed\n"
+        "- Mention any side effects\n"
+        "- Report if you're running low on supplies\n"
+        "Example: 'Took metformin 1000mg with breakfast as prescribed. No side effects today.'"
+    ),
+    LogType.SLEEP: (
+        "Describe your sleep:\n"
+        "- Report total sleep duration in hours\n"
+        "- Rate sleep quality (1-10)\n"
+        "- Note any sleep disturbances\n"
+        "- Mention if you feel well-rested\n"
+        "- Include any impact on morning glucose\n"
+        "Example: 'Slept 7 hours last night, quality 6/10. Woke up once. Morning glucose was 110 mg/dL.'"
+    ),
+    LogType.WEIGHT: (
+        "Report your weight status:\n"
+        "- Include current weight in kg or lbs\n"
+        "- Note any changes from last recording\n"
+        "- Mention if you're tracking weight regularly\n"
+        "- Include any concerns about weight management\n"
+        "- Note if you're following a weight management plan\n"
+        "Example: 'Current weight is 75kg, stable for the past week. Following my meal plan as prescribed.'"
+    ),
+    LogType.NOTES: (
+        "Share any additional observations:\n"
+        "- Note any unusual symptoms or changes\n"
+        "- Include any concerns about diabetes management\n"
+        "- Mention any questions for healthcare provider\n"
+        "- Report any lifestyle changes\n"
+        "- Note any upcoming medical appointments\n"
+        "Example: 'Noticed increased thirst today. Will monitor glucose more frequently and contact doctor if it continues.'"
+    ),
+    LogType.OTHER: (
+        "Share any other health information:\n"
+        "- Describe any new symptoms or concerns\n"
+        "- Note any changes in routine\n"
+        "- Include any questions about diabetes care\n"
+        "- Mention any upcoming medical appointments\n"
+        "- Report any issues with supplies or equipment\n"
+        "Example: 'My glucose meter battery is low. Need to replace it soon. Otherwise, feeling well today.'"
+    )
+}
+
+# Layout of the full prompt; filled in by build_prompt
+PROMPT_TEMPLATE = (
+    "{persona_instructions}\n\n"
+    "It is {time_str} ({time_context}), and you want to log a {log_type} update.\n\n"
+    "Guidelines for {log_type} logging:\n"
+    "{guidelines}\n\n"
+    "Generate a natural, conversational message as if you're talking to your healthcare provider. "
+    "Be specific and include all relevant details. "
+    "Keep your message concise but informative. "
+    "Use appropriate medical terminology where relevant.\n\n"
+    "Your message:"
+)
+
+# Time context for each hour of the day, indexed by hour
+HOUR_TO_TIME_CONTEXT = tuple(
+    "morning" if 5 <= hour < 12 else
+    "afternoon" if 12 <= hour < 17 else
+    "evening" if 17 <= hour < 22 else
+    "night"
+    for hour in range(24)
+)
+
 def get_time_context(time_str):
     """
     Determines the time context (morning, afternoon, evening, night) from time string.
@@ -14,15 +131,7 @@ def get_time_context(time_str):
     Returns:
         str: Time context description
     """
-    hour = int(time_str.split(":")[0])
-    if 5 <= hour < 12:
-        return "morning"
-    elif 12 <= hour < 17:
-        return "afternoon"
-    elif 17 <= hour < 22:
-        return "evening"
-    else:
-        return "night"
+    return HOUR_TO_TIME_CONTEXT[int(time_str.partition(":")[0])]
 
 def get_persona_instructions(persona):
     """
@@ -34,10 +143,13 @@ def get_persona_instructions(persona):
     Returns:
         str: Persona-specific instructions
     """
+    return _persona_instructions(persona.get_prompt_modifiers())
+
+def _persona_instructions(prompt_modifiers):
     return (
         "You are a diabetic patient using a chatbot to log health data.\n"
         "Your behavioral characteristics:\n"
-        f"{persona.get_prompt_modifiers()}\n"
+        f"{prompt_modifiers}\n"
         "Based on these characteristics, you should:\n"
         "- Adjust your language and tone accordingly\n"
         "- Match the expected logging frequency\n"
@@ -55,98 +167,7 @@ def get_log_type_guidelines(log_type):
     Returns:
         str: Type-specific guidelines
     """
-    guidelines = {
-        LogType.GLUCOSE: (
-            "Report your current blood glucose level:\n"
-            "- Include the exact value in mg/dL\n"
-            "- Specify if it's fasting, pre-meal, post-meal (how many hours after), or random\n"
-            "- Mention any factors that might have affected the reading\n"
-            "- Note if the reading is within your target range\n"
-            "Example: 'My fasting glucose this morning was 95 mg/dL, which is within my target range.'"
-        ),
-        LogType.DIET: (
-            "Describe your meal or snack:\n"
-            "- List all foods and beverages consumed\n"
-            "- Include approximate portion sizes\n"
-            "- Estimate carbohydrate content in grams\n"
-            "- Note if it's a regular meal, snack, or special occasion\n"
-            "- Mention if you're following your meal plan\n"
-            "Example: 'For lunch, I had a turkey sandwich (45g carbs) with an apple (15g carbs) and water.'"
-        ),
-        LogType.MOOD: (
-            "Describe your current state:\n"
-            "- Rate your mood on a scale of 1-10\n"
-            "- Note your energy level (low/medium/high)\n"
-            "- Mention any stress, anxiety, or other emotional factors\n"
-            "- Describe how these might affect your diabetes management\n"
-            "- Include any coping strategies you're using\n"
-            "Example: 'My mood is 7/10 today. Feeling energetic but a bit stressed about work deadlines.'"
-        ),
-        LogType.ACTIVITY: (
-            "Report your physical activity:\n"
-            "- Describe the type of exercise or activity\n"
-            "- Include duration in minutes\n"
-            "- Rate intensity (light/moderate/vigorous)\n"
-            "- Note if it's planned or spontaneous\n"
-            "- Mention any impact on blood glucose\n"
-            "Example: 'Did 30 minutes of moderate-intensity walking after dinner. Felt good, no hypoglycemia.'"
-        ),
-        LogType.INSULIN: (
-            "Report your insulin administration:\n"
-            "- Specify insulin type (basal/bolus)\n"
-            "- Include exact dose in units\n"
-            "- Note timing relative to meals\n"
-            "- Mention injection site\n"
-            "- Report any issues with administration\n"
-            "Example: 'Took 6 units of rapid-acting insulin 15 minutes before breakfast. Injected in abdomen.'"
-        ),
-        LogType.MEDICATION: (
-            "Report your medication status:\n"
-            "- List all diabetes-related medications taken\n"
-            "- Include dosage and timing\n"
-            "- Note if any doses were missed\n"
-            "- Mention any side effects\n"
-            "- Report if you're running low on supplies\n"
-            "Example: 'Took metformin 1000mg with breakfast as prescribed. No side effects today.'"
-        ),
-        LogType.SLEEP: (
-            "Describe your sleep:\n"
-            "- Report total sleep duration in hours\n"
-            "- Rate sleep quality (1-10)\n"
-            "- Note any sleep disturbances\n"
-            "- Mention if you feel well-rested\n"
-            "- Include any impact on morning glucose\n"
-            "Example: 'Slept 7 hours last night, quality 6/10. Woke up once. Morning glucose was 110 mg/dL.'"
-        ),
-        LogType.WEIGHT: (
-            "Report your weight status:\n"
-            "- Include current weight in kg or lbs\n"
-            "- Note any changes from last recording\n"
-            "- Mention if you're tracking weight regularly\n"
-            "- Include any concerns about weight management\n"
-            "- Note if you're following a weight management plan\n"
-            "Example: 'Current weight is 75kg, stable for the past week. Following my meal plan as prescribed.'"
-        ),
-        LogType.NOTES: (
-            "Share any additional observations:\n"
-            "- Note any unusual symptoms or changes\n"
-            "- Include any concerns about diabetes management\n"
-            "- Mention any questions for healthcare provider\n"
-            "- Report any lifestyle changes\n"
-            "- Note any upcoming medical appointments\n"
-            "Example: 'Noticed increased thirst today. Will monitor glucose more frequently and contact doctor if it continues.'"
-        ),
-        LogType.OTHER: (
-            "Share any other health information:\n"
-            "- Describe any new symptoms or concerns\n"
-            "- Note any changes in routine\n"
-            "- Include any questions about diabetes care\n"
-            "- Mention any upcoming medical appointments\n"
-            "- Report any issues with supplies or equipment\n"
-            "Example: 'My glucose meter battery is low. Need to replace it soon. Otherwise, feeling well today.'"
-        )
-    }
-    return guidelines.get(log_type, "Share any relevant health information.")
+    return LOG_TYPE_GUIDELINES.get(log_type, "Share any relevant health information.")
 
 def build_prompt(log_type, time_str, persona):
     """
@@ -161,18 +182,20 @@ def build_prompt(log_type, time_str, persona):
     Returns:
         str: Formatted prompt for the LLM
     """
+    return _render_prompt(log_type, time_str, persona.get_prompt_modifiers())
+
+# A persona only enters the prompt through its modifier text, so cache on that
+# rather than on the persona object, which the cache would otherwise keep alive
+@lru_cache(maxsize=2048)
+def _render_prompt(log_type, time_str, prompt_modifiers):
     time_context = get_time_context(time_str)
-    persona_instructions = get_persona_instructions(persona)
+    persona_instructions = _persona_instructions(prompt_modifiers)
     guidelines = get_log_type_guidelines(log_type)
     
-    return (
-        f"{persona_instructions}\n\n"
-        f"It is {time_str} ({time_context}), and you want to log a {log_type.value} update.\n\n"
-        f"Guidelines for {log_type.value} logging:\n"
-        f"{guidelines}\n\n"
-        f"Generate a natural, conversational message as if you're talking to your healthcare provider. "
-        f"Be specific and include all relevant details. "
-        f"Keep your message concise but informative. "
-        f"Use appropriate medical terminology where relevant.\n\n"
-        f"Your message:"
-    ) 
\ No newline at end of file
+    return PROMPT_TEMPLATE.format_map({
+        "persona_instructions": persona_instructions,
+        "time_str": time_str,
+        "time_context": time_context,
+        "log_type": log_type.value,
+        "guidelines": guidelines
+    }) 
\ No newline at end of file
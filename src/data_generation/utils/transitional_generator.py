@@ -5,52 +5,58 @@ Utility functions for generating logs for transitional personas.
 import json
 import random
 import os
-import sys
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from tqdm import tqdm
-from contextlib import contextmanager
 
 from TransitionalPersona import TransitionalPersona
 from Persona import LogEntry
 from utils.prompt_generator import build_prompt
-from utils.config import (
-    GENERATION_MAX_TOKENS,
-    GENERATION_TEMPERATURE
-)
+from utils.persona_log_generator import generate_message
+from utils.config import MODEL_SEED
 
-@contextmanager
-def suppress_stdout():
-    """Temporarily suppress stdout to prevent interference with progress bars."""
-    original_stdout = sys.stdout
-    sys.stdout = open(os.devnull, 'w')
-    try:
-        yield
-    finally:
-        sys.stdout.close()
-        sys.stdout = original_stdout
+@dataclass(frozen=True, slots=True)
+class PersonaSpec:
+    """Identifier and (consistency, frequency, variety) traits before and after the transition."""
+    id: str
+    initial: tuple[bool, bool, bool]
+    final: tuple[bool, bool, bool]
 
-def generate_message(llm, prompt, max_tokens=GENERATION_MAX_TOKENS, temperature=GENERATION_TEMPERATURE):
-    """
-    Runs prompt on LLM and returns response.
-    
-    Args:
-        llm: The language model instance
-        prompt: The prompt to run
-        max_tokens: Maximum number of tokens to generate
-        temperature: Temperature for generation (higher = more random)
-        
-    Returns:
-        str: The generated response text
-    """
-    with suppress_stdout():
-        response = llm(
-            prompt,
-            max_tokens=max_tokens,
-            temperature=temperature
-        )
-    return response["choices"][0]["text"].strip()
+# All transitional personas
+TRANSITIONAL_PERSONAS = (
+    # Adherence Breakdown
+    PersonaSpec(
+        id="Transitional_1_AdherenceBreakdown",
+        initial=(True, True, True),    # Consistent, Frequent, Varied
+        final=(False, False, False)    # Inconsistent, Infrequent, Similar
+    ),
+    # Gradual Improvement
+    PersonaSpec(
+        id="Transitional_2_GradualImprovement",
+        initial=(False, False, False), # Inconsistent, Infrequent, Similar
+        final=(True, True, True)       # Consistent, Frequent, Varied
+    ),
+    # Selective Adherence
+    PersonaSpec(
+        id="Transitional_3_SelectiveAdherence",
+        initial=(True, True, True),    # Consistent, Frequent, Varied
+        final=(True, False, False)     # Consistent, Infrequent, Similar
+    ),
+    # Erratic Behavior
+    PersonaSpec(
+        id="Transitional_4_ErraticBehavior",
+        initial=(True, False, False),  # Consistent, Infrequent, Similar
+        final=(False, True, True)      # Inconsistent, Frequent, Varied
+    ),
+    # Minimal to Detailed
+    PersonaSpec(
+        id="Transitional_5_MinimalToDetailed",
+        initial=(False, False, False), # Inconsistent, Infrequent, Similar
+        final=(True, True, True)       # Consistent, Frequent, Varied
+    )
+)
 
-def simulate_log(llm, persona, timestamp, log_type, current_day):
+def simulate_log(llm, persona, timestamp, log_type, current_day, traits=None):
     """
     Simulates a log entry for a persona at a given timestamp.
     
@@ -60,6 +66,8 @@ def simulate_log(llm, persona, timestamp, log_type, current_day):
         timestamp: When the log was created
         log_type: Type of log entry
         current_day: The current day (0-based)
+        traits: The persona's (consistency, frequency, variety) traits for current_day,
+            if the caller already has them
         
     Returns:
         LogEntry: The generated log entry
@@ -69,7 +77,9 @@ def simulate_log(llm, persona, timestamp, log_type, current_day):
     message = generate_message(llm, prompt)
     
     # Get current traits
-    consistency, frequency, variety = persona.get_current_traits(current_day)
+    if traits is None:
+        traits = persona.get_current_traits(current_day)
+    consistency, frequency, variety = traits
     
     return LogEntry(
         timestamp=timestamp,
@@ -91,7 +101,8 @@ def generate_transitional_persona_logs(
     initial_traits,
     final_traits,
     days=30,
-    output_dir="synthetic_logs/transitional"
+    output_dir="synthetic_logs/transitional",
+    rng=None
 ):
     """
     Generates synthetic logs for a transitional persona.
@@ -103,10 +114,14 @@ def generate_transitional_persona_logs(
         final_traits: Tuple of (consistency, frequency, variety) for final phase
         days: Number of days to generate logs for
         output_dir: Directory to save the generated logs
+        rng: Random generator for persona traits and log draws (default: a new unseeded one)
         
     Returns:
         list: List of generated log entries
     """
+    if rng is None:
+        rng = random.Random()
+    
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
@@ -118,7 +133,8 @@ def generate_transitional_persona_logs(
         initial_variety=initial_traits[2],
         final_consistency=final_traits[0],
         final_frequency=final_traits[1],
-        final_variety=final_traits[2]
+        final_variety=final_traits[2],
+        rng=rng
     )
     
     # Generate logs
@@ -130,35 +146,33 @@ def generate_transitional_persona_logs(
         for day in range(days):
             day_start = base_date + timedelta(days=day)
             
-            # Get current traits for this day
-            consistency, frequency, variety = persona.get_current_traits(day)
+            # Get current traits for this day, shared by all of the day's logs
+            traits = persona.get_current_traits(day)
+            consistency, frequency, variety = traits
             
             # Get number of logs for this day based on frequency trait
             min_logs, max_logs = frequency.logs_per_day
-            logs_per_day = random.randint(min_logs, max_logs)
+            logs_per_day = rng.randint(min_logs, max_logs)
             
-            # Get log times for this day
+            # Get log times for this day (already sorted)
             log_times = persona.generate_log_times(day_start, day, logs_per_day)
             
+            # Draw the log types for the whole day at once
+            log_types = persona.choose_log_types(len(log_times), day)
+            
             # Generate logs for each time point
-            for log_time in sorted(log_times):
-                # Get weighted log types for this persona
-                weighted_log_types = []
-                log_type_weights = persona.get_log_type_weights(day)
-                for log_type, weight in log_type_weights.items():
-                    weighted_log_types.extend([log_type] * weight)
-                    
-                log_type = random.choice(weighted_log_types)
-                log = simulate_log(llm, persona, log_time, log_type, day)
+            for log_time, log_type in zip(log_times, log_types):
+                log = simulate_log(llm, persona, log_time, log_type, day, traits)
                 logs.append(log)
             
+            # Set the postfix without redrawing; update() then renders the bar once
+            pbar.set_postfix({"logs": len(logs)}, refresh=False)
             pbar.update(1)
-            pbar.set_postfix({"logs": len(logs)})
     
     # Save logs
     output_file = os.path.join(output_dir, f"{user_id}_logs.json")
     with open(output_file, "w") as f:
-        json.dump([log.__dict__ for log in logs], f, indent=2, default=str)
+        f.write(json.dumps([log.to_dict() for log in logs], indent=2, default=str))
         
     tqdm.write(f"Generated {len(logs)} logs for {user_id}")
     return logs
@@ -166,7 +180,8 @@ def generate_transitional_persona_logs(
 def generate_all_transitional_personas(
     llm,
     days=30,
-    output_dir="synthetic_logs/transitional"
+    output_dir="synthetic_logs/transitional",
+    seed=MODEL_SEED
 ):
     """
     Generates logs for all transitional personas.
@@ -175,59 +190,29 @@ def generate_all_transitional_personas(
         llm: The language model instance to use for generation
         days: Number of days to generate logs for
         output_dir: Directory to save the generated logs
+        seed: Seed for the random generator shared by all personas, so reruns are reproducible
         
     Returns:
         dict: Dictionary mapping user IDs to their log entries
     """
-    # Define all transitional personas
-    transitional_personas = [
-        # Adherence Breakdown
-        {
-            "id": "Transitional_1_AdherenceBreakdown",
-            "initial": (True, True, True),    # Consistent, Frequent, Varied
-            "final": (False, False, False)    # Inconsistent, Infrequent, Similar
-        },
-        # Gradual Improvement
-        {
-            "id": "Transitional_2_GradualImprovement",
-            "initial": (False, False, False), # Inconsistent, Infrequent, Similar
-            "final": (True, True, True)       # Consistent, Frequent, Varied
-        },
-        # Selective Adherence
-        {
-            "id": "Transitional_3_SelectiveAdherence",
-            "initial": (True, True, True),    # Consistent, Frequent, Varied
-            "final": (True, False, False)     # Consistent, Infrequent, Similar
-        },
-        # Erratic Behavior
-        {
-            "id": "Transitional_4_ErraticBehavior",
-            "initial": (True, False, False),  # Consistent, Infrequent, Similar
-            "final": (False, True, True)      # Inconsistent, Frequent, Varied
-        },
-        # Minimal to Detailed
-        {
-            "id": "Transitional_5_MinimalToDetailed",
-            "initial": (False, False, False), # Inconsistent, Infrequent, Similar
-            "final": (True, True, True)       # Consistent, Frequent, Varied
-        }
-    ]
+    rng = random.Random(seed)
     
     all_logs = {}
     
     # Create progress bar for personas
-    with tqdm(total=len(transitional_personas), desc="Generating logs for transitional personas", unit="persona") as pbar:
-        for persona in transitional_personas:
+    with tqdm(total=len(TRANSITIONAL_PERSONAS), desc="Generating logs for transitional personas", unit="persona") as pbar:
+        for spec in TRANSITIONAL_PERSONAS:
             logs = generate_transitional_persona_logs(
                 llm=llm,
-                user_id=persona["id"],
-                initial_traits=persona["initial"],
-                final_traits=persona["final"],
+                user_id=spec.id,
+                initial_traits=spec.initial,
+                final_traits=spec.final,
                 days=days,
-                output_dir=output_dir
+                output_dir=output_dir,
+                rng=rng
             )
-            all_logs[persona["id"]] = logs
+            all_logs[spec.id] = logs
+            pbar.set_postfix({"current": spec.id}, refresh=False)
             pbar.update(1)
-            pbar.set_postfix({"current": persona["id"]})
     
     return all_logs 
\ No newline at end of file
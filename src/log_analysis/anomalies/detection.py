@@ -1,29 +1,32 @@
 import numpy as np
 import json
 import os
+from entropy.calculation import read_json_cached
+
+FEATURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), 'extracted_features')
+ENTROPY_RESULTS_FILE = os.path.join(FEATURES_DIR, 'entropy_results.json')
+ANOMALY_RESULTS_FILE = os.path.join(FEATURES_DIR, 'anomaly_results.json')
+
+def load_entropy_results():
+    if not os.path.exists(ENTROPY_RESULTS_FILE):
+        raise FileNotFoundError(f"Entropy results file not found at {ENTROPY_RESULTS_FILE}")
+    return read_json_cached(ENTROPY_RESULTS_FILE)
 
 def detect_anomalies_moving_average(data, window_size=5, threshold=2.0):
     if len(data) < window_size:
         return []
-    anomalies = []
-    for i in range(window_size, len(data)):
-        window = data[i-window_size:i]
-        mean = np.mean(window)
-        std = np.std(window)
-        if std == 0:
-            continue
-        if abs(data[i] - mean) > threshold * std:
-            anomalies.append((i, data[i]))
-    return anomalies
+    values = np.asarray(data, dtype=np.float64)
+    # Row k holds the trailing window data[k:k+window_size] for point k+window_size
+    windows = np.lib.stride_tricks.sliding_window_view(values, window_size)[:-1]
+    means = windows.mean(axis=1)
+    stds = windows.std(axis=1)
+    current = values[window_size:]
+    mask = (stds != 0) & (np.abs(current - means) > threshold * stds)
+    return [(int(i), data[i]) for i in np.flatnonzero(mask) + window_size]
 
-def analyze_user_entropy_anomalies(user_id, feature_type):
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    features_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(current_dir))), 'extracted_features')
-    filepath = os.path.join(features_dir, 'entropy_results.json')
-    if not os.path.exists(filepath):
-        raise FileNotFoundError(f"Entropy results file not found at {filepath}")
-    with open(filepath, 'r') as f:
-        all_results = json.load(f)
+def analyze_user_entropy_anomalies(user_id, feature_type, all_results=None):
+    if all_results is None:
+        all_results = load_entropy_results()
     if feature_type not in all_results:
         raise KeyError(f"Feature type {feature_type} not found in entropy results")
     if user_id not in all_results[feature_type]:
@@ -56,27 +59,18 @@ def analyze_user_entropy_anomalies(user_id, feature_type):
 
 def analyze_all_users_entropy_anomalies(feature_type):
     # ... (same as in AnomalyDet.py)
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    features_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(current_dir))), 'extracted_features')
-    filepath = os.path.join(features_dir, 'entropy_results.json')
-    if not os.path.exists(filepath):
-        raise FileNotFoundError(f"Entropy results file not found at {filepath}")
-    with open(filepath, 'r') as f:
-        all_results = json.load(f)
+    all_results = load_entropy_results()
     if feature_type not in all_results:
         raise KeyError(f"Feature type {feature_type} not found in entropy results")
     results = {}
     for user_id in all_results[feature_type].keys():
         try:
-            results[user_id] = analyze_user_entropy_anomalies(user_id, feature_type)
+            results[user_id] = analyze_user_entropy_anomalies(user_id, feature_type, all_results=all_results)
         except Exception as e:
             print(f"Error analyzing user {user_id}: {str(e)}")
     return results
 
 def save_anomaly_results(all_results):
     # ... (same as in AnomalyDet.py)
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    features_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(current_dir))), 'extracted_features')
-    output_file = os.path.join(features_dir, 'anomaly_results.json')
-    with open(output_file, 'w') as f:
-        json.dump(all_results, f, indent=2) 
\ No newline at end of file
+    with open(ANOMALY_RESULTS_FILE, 'w') as f:
+        f.write(json.dumps(all_results, indent=2)) 
\ No newline at end of file
@@ -1,21 +1,66 @@
 import numpy as np
 import json
-from collections import Counter, defaultdict
+from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 import os
 
+BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
+FEATURES_DIR = BASE_DIR / 'extracted_features'
+FEATURES_FILE = FEATURES_DIR / 'extracted_features.json'
+ENTROPY_RESULTS_FILE = FEATURES_DIR / 'entropy_results.json'
+LOGS_DIR = BASE_DIR / 'synthetic_logs'
+
+@lru_cache(maxsize=2)
+def _read_json(path, mtime_ns):
+    # mtime_ns only keys the cache, so a rewritten file is parsed again
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def read_json_cached(path):
+    """
+    Load a JSON file, parsing it only once per version of the file.
+    The parsed object is shared by every caller, so treat it as read-only.
+    """
+    return _read_json(path, os.stat(path).st_mtime_ns)
+
+@lru_cache(maxsize=1)
+def _index_log_files(logs_dir):
+    # Map each user id to the first matching log file, walking the tree only once
+    index = {}
+    for root, dirs, files in os.walk(logs_dir):
+        for filename in files:
+            if filename.endswith('_logs.json'):
+                index.setdefault(filename[:-len('_logs.json')], Path(root) / filename)
+    return index
+
+def load_features():
+    """
+    Load extracted_features.json, parsing it only once per version of the file.
+    """
+    if not FEATURES_FILE.exists():
+        raise FileNotFoundError(f"Features file not found at {FEATURES_FILE}")
+    return read_json_cached(FEATURES_FILE)
+
 def calculate_entropy(values):
     # ... (same as in EntropyCalc.py)
     if not values:
         return 0.0
-    counts = Counter(values)
-    total = len(values)
-    entropy = 0.0
-    for count in counts.values():
-        probability = count / total
-        entropy -= probability * np.log2(probability)
-    return entropy
+    _, counts = np.unique(values, return_counts=True)
+    return float(calculate_entropy_from_counts(counts))
+
+def calculate_entropy_from_counts(counts):
+    """
+    Shannon entropy (bits) of category counts, computed along the last axis.
+    Rows without any counts have an entropy of 0.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    totals = counts.sum(axis=-1, keepdims=True)
+    probabilities = np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+    log_probabilities = np.log2(probabilities, out=np.zeros_like(probabilities), where=probabilities > 0)
+    # Subtract from 0.0 rather than negate so single-category windows give 0.0, not -0.0
+    return 0.0 - (probabilities * log_probabilities).sum(axis=-1)
 
 def group_data_by_day(data, timestamps, logs=None):
     """
@@ -41,26 +86,24 @@ def calculate_window_entropy(data, timestamps, window_size=10):
         return []
     grouped_data = group_data_by_day(data, timestamps)
     dates = sorted(grouped_data.keys())
-    entropies = []
-    for i in range(window_size - 1, len(dates)):
-        window_dates = dates[i - window_size + 1:i + 1]
-        window_values = []
-        for date in window_dates:
-            window_values.extend(grouped_data[date])
-        entropy = calculate_entropy(window_values)
-        entropies.append(entropy)
-    return entropies
+    if len(dates) < window_size:
+        return []
+    # Encode the values once and count them per day: a (days, categories) matrix
+    categories, codes = np.unique([value for date in dates for value in grouped_data[date]], return_inverse=True)
+    n_days, n_categories = len(dates), len(categories)
+    day_index = np.repeat(np.arange(n_days), [len(grouped_data[date]) for date in dates])
+    day_counts = np.bincount(day_index * n_categories + codes, minlength=n_days * n_categories)
+    day_counts = day_counts.reshape(n_days, n_categories)
+    # Consecutive windows differ by one day in and one day out, so every window's
+    # frequency table is a difference of running per-day totals
+    cumulative = np.concatenate((np.zeros((1, n_categories), dtype=day_counts.dtype), np.cumsum(day_counts, axis=0)))
+    window_counts = cumulative[window_size:] - cumulative[:-window_size]
+    return calculate_entropy_from_counts(window_counts).tolist()
 
 def analyze_user_entropy(user_id, feature_type, all_features=None):
     # ... (same as in EntropyCalc.py)
-    base_dir = Path(__file__).resolve().parent.parent.parent.parent
     if all_features is None:
-        features_dir = base_dir / 'extracted_features'
-        features_path = features_dir / 'extracted_features.json'
-        if not features_path.exists():
-            raise FileNotFoundError(f"Features file not found at {features_path}")
-        with open(features_path, 'r') as f:
-            all_features = json.load(f)
+        all_features = load_features()
     if user_id not in all_features:
         raise KeyError(f"User {user_id} not found in features file")
     user_data = all_features[user_id]
@@ -90,18 +133,14 @@ def analyze_user_entropy(user_id, feature_type, all_features=None):
             'max_entropy': 0.0,
             'min_entropy': 0.0
         }
-    logs_dir = base_dir / 'synthetic_logs'
-    # Recursively search for the log file in all subdirectories
-    log_file = None
-    for root, dirs, files in os.walk(logs_dir):
-        for filename in files:
-            if filename == f'{user_id}_logs.json':
-                log_file = Path(root) / filename
-                break
-        if log_file:
-            break
+    # Look up the log file among all subdirectories
+    log_file = _index_log_files(LOGS_DIR).get(user_id)
+    if not log_file or not log_file.exists():
+        # Logs may have been added or removed since the index was built
+        _index_log_files.cache_clear()
+        log_file = _index_log_files(LOGS_DIR).get(user_id)
     if not log_file or not log_file.exists():
-        raise FileNotFoundError(f"Log file not found for user {user_id} in {logs_dir} or its subdirectories")
+        raise FileNotFoundError(f"Log file not found for user {user_id} in {LOGS_DIR} or its subdirectories")
     with open(log_file, 'r') as f:
         logs = json.load(f)
     # Special handling for logging_frequency: use dates as timestamps
@@ -123,13 +162,7 @@ def analyze_user_entropy(user_id, feature_type, all_features=None):
 
 def analyze_all_users_entropy(feature_type):
     # ... (same as in EntropyCalc.py)
-    base_dir = Path(__file__).resolve().parent.parent.parent.parent
-    features_dir = base_dir / 'extracted_features'
-    features_path = features_dir / 'extracted_features.json'
-    if not features_path.exists():
-        raise FileNotFoundError(f"Features file not found at {features_path}")
-    with open(features_path, 'r') as f:
-        all_features = json.load(f)
+    all_features = load_features()
     results = {}
     for user_id in all_features.keys():
         try:
@@ -140,8 +173,5 @@ def analyze_all_users_entropy(feature_type):
 
 def save_entropy_results(all_results):
     # ... (same as in EntropyCalc.py)
-    base_dir = Path(__file__).resolve().parent.parent.parent.parent
-    features_dir = base_dir / 'extracted_features'
-    output_file = features_dir / 'entropy_results.json'
-    with open(output_file, 'w') as f:
-        json.dump(all_results, f, indent=2) 
\ No newline at end of file
+    with open(ENTROPY_RESULTS_FILE, 'w') as f:
+        f.write(json.dumps(all_results, indent=2)) 
\ No newline at end of file
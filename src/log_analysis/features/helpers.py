@@ -6,7 +6,19 @@ from datetime import datetime
 from collections import defaultdict
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+# Lower bin edges for text similarity categories, in the order of SIMILARITY_CATEGORIES
+SIMILARITY_BIN_EDGES = np.array([0.2, 0.4, 0.7])
+SIMILARITY_CATEGORIES = np.array(["different", "moderately_different", "similar", "identical"])
+
+# Time-of-day category for each hour of the day, indexed by hour
+HOUR_TO_TIME_OF_DAY = tuple(
+    "morning" if 5 <= hour < 12 else
+    "afternoon" if 12 <= hour < 17 else
+    "evening" if 17 <= hour < 22 else
+    "night"
+    for hour in range(24)
+)
 
 def get_time_of_day_category(timestamp: str) -> str:
     """
@@ -18,15 +30,7 @@ def get_time_of_day_category(timestamp: str) -> str:
     Returns:
         str: Time of day category (morning, afternoon, evening, night)
     """
-    hour = datetime.fromisoformat(timestamp).hour
-    if 5 <= hour < 12:
-        return "morning"
-    elif 12 <= hour < 17:
-        return "afternoon"
-    elif 17 <= hour < 22:
-        return "evening"
-    else:
-        return "night"
+    return HOUR_TO_TIME_OF_DAY[datetime.fromisoformat(timestamp).hour]
 
 def discretize_logging_frequency(logs_per_day: float) -> str:
     """
@@ -66,6 +70,19 @@ def discretize_text_similarity(similarity: float) -> str:
     else:
         return "different"
 
+def discretize_text_similarities(similarities) -> list:
+    """
+    Discretize a sequence of text similarity scores in one pass.
+    
+    Args:
+        similarities: Cosine similarity scores between consecutive messages
+        
+    Returns:
+        list: Similarity categories, matching discretize_text_similarity for each score
+    """
+    codes = np.digitize(similarities, SIMILARITY_BIN_EDGES)
+    return SIMILARITY_CATEGORIES[codes].tolist()
+
 def calculate_logging_frequency(logs: list) -> dict:
     """
     Calculate number of logs per day.
@@ -103,15 +120,10 @@ def calculate_text_similarity(logs: list) -> list:
     try:
         tfidf_matrix = vectorizer.fit_transform(messages)
         
-        # Calculate cosine similarity between consecutive messages
-        similarities = []
-        for i in range(len(messages) - 1):
-            similarity = cosine_similarity(
-                tfidf_matrix[i:i+1], 
-                tfidf_matrix[i+1:i+2]
-            )[0][0]
-            similarities.append(similarity)
-        return similarities
+        # TF-IDF rows are L2-normalized, so the cosine similarity of consecutive
+        # messages is the row-wise dot product of each row with the next one
+        similarities = tfidf_matrix[:-1].multiply(tfidf_matrix[1:]).sum(axis=1)
+        return np.asarray(similarities).ravel().tolist()
     except:
         # Return zeros if vectorization fails (e.g., empty messages)
         return [0] * (len(messages) - 1) 
\ No newline at end of file
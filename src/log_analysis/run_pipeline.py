@@ -1,8 +1,11 @@
 import os
+import matplotlib
+# Plots are only ever written to disk, so skip interactive backend selection and GUI setup
+matplotlib.use('Agg')
 from features.extraction import extract_user_features
 from entropy.calculation import analyze_all_users_entropy, save_entropy_results
 from anomalies.detection import analyze_all_users_entropy_anomalies, save_anomaly_results
-from anomalies.plotting import plot_entropy_with_anomalies
+from anomalies.plotting import plot_entropy_with_anomalies, close_plots
 import json
 
 
@@ -14,7 +17,7 @@ def main():
     os.makedirs(features_dir, exist_ok=True)
     features_file = os.path.join(features_dir, 'extracted_features.json')
     with open(features_file, 'w') as f:
-        json.dump(features_by_user, f, indent=2)
+        f.write(json.dumps(features_by_user, indent=2))
     print(f"Features saved to {features_file}")
 
     # 2. Entropy Calculation
@@ -42,13 +45,12 @@ def main():
 
     # 4. Plotting
     print("[4/4] Plotting entropy and anomalies...")
-    # Load entropy results for plotting
-    with open(entropy_file, 'r') as f:
-        entropy_results = json.load(f)
+    # Entropy results are still in memory from step 2, so plot straight from them
     for feature_type in feature_types:
         for user_id, analysis in all_anomaly_results[feature_type].items():
-            entropy_data = entropy_results[feature_type][user_id]['entropies']
+            entropy_data = all_entropy_results[feature_type][user_id]['entropies']
             plot_entropy_with_anomalies(user_id, feature_type, entropy_data, analysis['anomalies'])
+    close_plots()
     print("Plots saved in extracted_features/entropy_plots/")
     print("\nPipeline completed successfully.")
 